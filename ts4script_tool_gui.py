@@ -1,22 +1,42 @@
 #!/usr/bin/env python3
 # TS4ScriptTool GUI - Tkinter-based tool for .ts4script extract/pack/watch.
-# No external dependencies. Python 3.8+ recommended.
+# No required external dependencies (uses `watchfiles` and `deflate` for
+# speed when installed). Python 3.8+ recommended.
+import io
 import os
+import re
+import shutil
 import sys
 import time
 import threading
 import zipfile
+import zlib
 import fnmatch
-import hashlib
+import glob
 import json
-from dataclasses import dataclass
+import struct
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict
+from functools import lru_cache
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Optional, Dict, Pattern, Sequence
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+try:  # Optional: OS-level change notifications instead of polling.
+    from watchfiles import watch as fs_watch
+except ImportError:
+    fs_watch = None
+
+try:  # Optional: libdeflate bindings, roughly 2x faster than zlib at equal ratio.
+    import deflate as libdeflate
+except ImportError:
+    libdeflate = None
+
 DEFAULT_IGNORE = [
     "__pycache__/",
     "*.pyc",
@@ -34,6 +54,31 @@ APP_TITLE = "TS4ScriptTool GUI"
 APP_VERSION = "1.0.0"
 STATE_PATH = Path.home() / ".ts4script_tool_state.json"
 
+PACK_COMPRESSLEVEL = 6
+# Files above this size (and stored files) are streamed on the writing thread
+# instead of being buffered for the compression pool.
+LIBDEFLATE_MAX_SIZE = 8 * 1024 * 1024
+# Most bytes of file data the pack pool may hold in memory at once.
+PACK_BUFFER_MAX = 64 * 1024 * 1024
+# Chunk size for every streamed copy.
+STREAM_CHUNK = 128 * 1024
+# Archives up to this size are read into memory in one go before extracting.
+EXTRACT_IN_MEMORY_MAX = 100 * 1024 * 1024
+# Already-compressed formats: deflating them costs CPU for no size gain.
+STORED_EXTS = frozenset({
+    ".png", ".jpg", ".jpeg", ".mp3", ".ogg", ".mp4",
+    ".zip", ".gz", ".xz", ".woff", ".woff2",
+})
+
+# (mtime_ns, size) of a file.
+Stamp = Tuple[int, int]
+# Archives written by zip_dir in this session: dst path -> (source workspace,
+# archive stamp, {arcname: source file stamp}). Lets repacks of the same
+# workspace copy unchanged entries verbatim.
+_PACK_CACHE: Dict[str, Tuple[str, Stamp, Dict[str, Stamp]]] = {}
+# workspace -> (.ts4ignore stamp or None if absent, patterns).
+_IGNORE_CACHE: Dict[str, Tuple[Optional[Stamp], Tuple[str, ...]]] = {}
+
 # ----------------------- Utility functions -----------------------
 
 def read_ignore_file(workspace: Path) -> List[str]:
@@ -48,89 +93,413 @@ def write_ignore_file(workspace: Path, patterns: List[str]) -> None:
     text = "\n".join(patterns) + "\n" if patterns else ""
     ignore_path.write_text(text, encoding="utf-8")
 
-def should_ignore(rel_path: str, patterns: List[str]) -> bool:
+def get_ignore_patterns(workspace: Path) -> Tuple[str, ...]:
+    # read_ignore_file(), re-read only when .ts4ignore changes. Cheap enough to
+    # call on every watch tick, so edits apply without restarting the watcher.
+    key = os.path.abspath(workspace)
+    stamp = file_stamp(workspace / ".ts4ignore")
+    cached = _IGNORE_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    patterns = tuple(read_ignore_file(workspace))
+    _IGNORE_CACHE[key] = (stamp, patterns)
+    return patterns
+
+# (directory prefixes, all patterns as one regex) - see compile_ignore().
+IgnoreRules = Tuple[Tuple[str, ...], Optional[Pattern[str]]]
+
+# fnmatch.fnmatch() normcases both sides, i.e. it is case-insensitive on Windows
+# and treats "\\" in a pattern as a path separator there.
+_IGNORE_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+_BACKSLASH_SEP = os.sep == "\\"
+
+_GLOB_CHARS = re.compile(r"[*?[]")
+
+@lru_cache(maxsize=64)
+def compile_ignore(patterns: Tuple[str, ...]) -> IgnoreRules:
+    if _BACKSLASH_SEP:
+        # Paths are matched in "/" form, so patterns like tools\* must be too.
+        patterns = tuple(p.replace("\\", "/") for p in patterns)
+    dir_prefixes = tuple(p for p in patterns if p.endswith("/"))
+    # A literal "dir/" pattern can only fnmatch the path "dir/" itself, which the
+    # prefix test already covers - unless matching is case-insensitive.
+    globs = [p for p in patterns if _IGNORE_FLAGS or not p.endswith("/") or _GLOB_CHARS.search(p)]
+    glob_re = None
+    if globs:
+        glob_re = re.compile("|".join(fnmatch.translate(p) for p in globs), _IGNORE_FLAGS)
+    return dir_prefixes, glob_re
+
+@lru_cache(maxsize=64)
+def compile_walk_rules(patterns: Tuple[str, ...]) -> Tuple[IgnoreRules, frozenset, IgnoreRules]:
+    # (all rules, top-level dir names, rules for entries below the root).
+    # A bare "name/" prefix can only ever match a top-level directory, so those
+    # are pruned by name at the root and skipped by every deeper check.
+    rules = compile_ignore(patterns)
+    dir_prefixes, glob_re = rules
+    top_names = frozenset(p[:-1] for p in dir_prefixes if p.index("/") == len(p) - 1)
+    deep_rules = (tuple(p for p in dir_prefixes if p.index("/") < len(p) - 1), glob_re)
+    return rules, top_names, deep_rules
+
+def is_ignored(rel_path: str, rules: IgnoreRules) -> bool:
     rp = rel_path.replace("\\", "/")
-    for pat in patterns:
-        if pat.endswith("/"):
-            if rp.startswith(pat):
-                return True
-        if fnmatch.fnmatch(rp, pat):
-            return True
-    return False
-
-def zip_dir(src_dir: Path, dst_zip: Path, ignore_patterns: List[str]) -> None:
-    if dst_zip.exists():
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup = dst_zip.with_suffix(f".bak_{ts}.ts4script")
+    dir_prefixes, glob_re = rules
+    if rp.startswith(dir_prefixes):
+        return True
+    return glob_re is not None and glob_re.match(rp) is not None
+
+def file_stamp(path: Path) -> Optional[Stamp]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def iter_raw_entry(fp: BinaryIO, zinfo: zipfile.ZipInfo) -> Iterator[bytes]:
+    # Compressed bytes of an entry, without its local header, in STREAM_CHUNK pieces.
+    fp.seek(zinfo.header_offset)
+    header = fp.read(zipfile.sizeFileHeader)
+    if header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local header for '{zinfo.filename}'")
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    fp.seek(name_len + extra_len, os.SEEK_CUR)
+    remaining = zinfo.compress_size
+    while remaining > 0:
+        chunk = fp.read(min(remaining, STREAM_CHUNK))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated data for '{zinfo.filename}'")
+        remaining -= len(chunk)
+        yield chunk
+
+def read_raw_entry(fp: BinaryIO, zinfo: zipfile.ZipInfo) -> bytes:
+    return b"".join(iter_raw_entry(fp, zinfo))
+
+def write_precompressed(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, payload: bytes) -> None:
+    write_raw_chunks(zf, zinfo, len(payload), (payload,))
+
+def write_raw_chunks(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, compress_size: int,
+                     chunks: Iterable[bytes]) -> None:
+    # zipfile has no public API for already-compressed data, so mirror what
+    # ZipFile.open(mode="w") does with CRC and sizes known up front.
+    # zinfo.CRC and zinfo.file_size must describe the uncompressed data.
+    zinfo.compress_size = compress_size
+    zinfo.flag_bits = 0
+    if not zinfo.external_attr:
+        zinfo.external_attr = 0o600 << 16
+    with zf._lock:
+        zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader())
+        for chunk in chunks:
+            zf.fp.write(chunk)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+# (file count, total size, newest mtime_ns, entry fingerprint)
+TreeSignature = Tuple[int, int, int, int]
+
+# (absolute path, arcname, stat result) of a file to pack.
+ScanEntry = Tuple[str, str, os.stat_result]
+
+def scan_tree(path: Path, ignore_patterns: Sequence[str]) -> Tuple[TreeSignature, List[ScanEntry]]:
+    files: List[ScanEntry] = []
+    total_files = 0
+    total_size = 0
+    max_mtime = 0
+    # XOR of per-file tuple hashes: order-independent and computed in C, yet
+    # still catches renames and mtime-preserving copies the totals would miss.
+    # str hashes are salted per process, which is fine for in-session compares.
+    fingerprint = 0
+    rules, top_names, deep_rules = compile_walk_rules(tuple(ignore_patterns))
+    # scandir keeps the stat result on each DirEntry, so every file costs one
+    # syscall, and ignored entries never get a Path built for them.
+    stack = [(os.fspath(path), "")]
+    while stack:
+        dir_path, rel_prefix = stack.pop()
+        level_rules = deep_rules if rel_prefix else rules
         try:
-            from shutil import copy2
-            copy2(dst_zip, backup)
-        except Exception:
-            pass
-    with zipfile.ZipFile(dst_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for root, dirs, files in os.walk(src_dir):
-            root_p = Path(root)
-            # Remove ignored dirs
-            kept_dirs = []
-            for d in dirs:
-                rel_dir = (root_p / d).relative_to(src_dir).as_posix() + "/"
-                if should_ignore(rel_dir, ignore_patterns):
+            it = os.scandir(dir_path)
+        except OSError:
+            continue
+        subdirs = []
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk(): symlinked dirs are neither descended nor counted.
+                    if entry.is_symlink() or (not rel_prefix and entry.name in top_names):
+                        continue
+                    rel = rel_prefix + entry.name + "/"
+                    if not is_ignored(rel, level_rules):
+                        subdirs.append((entry.path, rel))
                     continue
-                kept_dirs.append(d)
-            dirs[:] = kept_dirs
-
-            for name in files:
-                abs_path = root_p / name
-                rel = abs_path.relative_to(src_dir).as_posix()
-                if should_ignore(rel, ignore_patterns):
+                rel = rel_prefix + entry.name
+                if is_ignored(rel, level_rules):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
                     continue
-                zf.write(abs_path, arcname=rel)
+                total_files += 1
+                total_size += st.st_size
+                if st.st_mtime_ns > max_mtime:
+                    max_mtime = st.st_mtime_ns
+                fingerprint ^= hash((rel, st.st_mtime_ns, st.st_size))
+                files.append((entry.path, rel, st))
+        # Visit subdirectories in listing order, as os.walk() does.
+        stack.extend(reversed(subdirs))
+    return (total_files, total_size, max_mtime, fingerprint), files
+
+def zipinfo_from_stat(arcname: str, st: os.stat_result) -> zipfile.ZipInfo:
+    # ZipInfo.from_file() minus its second stat. Like strict_timestamps=False,
+    # mtimes outside the DOS range are clamped instead of raising.
+    date_time = time.localtime(st.st_mtime)[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    elif date_time[0] > 2107:
+        date_time = (2107, 12, 31, 23, 59, 59)
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    return zinfo
+
+def compress_entry(abs_path: str, zinfo: zipfile.ZipInfo) -> Optional[bytes]:
+    # Runs on pack worker threads; zlib and libdeflate release the GIL while compressing.
+    # Only used for deflated files up to LIBDEFLATE_MAX_SIZE; larger and stored
+    # files go through stream_entry(). Returns None if the file was removed since the scan.
+    try:
+        fh = open(abs_path, "rb", buffering=0)
+    except FileNotFoundError:
+        return None
+    with fh:
+        if libdeflate is not None or zinfo.file_size <= 2 * STREAM_CHUNK:
+            data = fh.readall()
+            zinfo.file_size = len(data)
+            zinfo.CRC = zlib.crc32(data)
+            if libdeflate is not None:
+                return libdeflate.deflate_compress(data, PACK_COMPRESSLEVEL)
+            co = zlib.compressobj(PACK_COMPRESSLEVEL, zlib.DEFLATED, -15)
+            return co.compress(data) + co.flush()
+
+        # zlib fallback for bigger files: feed one reusable STREAM_CHUNK buffer
+        # through compressobj so only the compressed output is held.
+        co = zlib.compressobj(PACK_COMPRESSLEVEL, zlib.DEFLATED, -15)
+        buf = bytearray(STREAM_CHUNK)
+        view = memoryview(buf)
+        crc = 0
+        size = 0
+        out = []
+        while True:
+            n = fh.readinto(buf)
+            if not n:
+                break
+            chunk = view[:n]
+            crc = zlib.crc32(chunk, crc)
+            size += n
+            out.append(co.compress(chunk))
+        out.append(co.flush())
+        zinfo.file_size = size
+        zinfo.CRC = crc
+        return b"".join(out)
+
+def stream_entry(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, abs_path: str) -> bool:
+    # Constant-memory write for stored and large files. zipfile compresses with
+    # zlib's default level, which is PACK_COMPRESSLEVEL. Returns False if the
+    # file was removed since the scan.
+    try:
+        fh = open(abs_path, "rb", buffering=0)
+    except FileNotFoundError:
+        return False
+    with fh, zf.open(zinfo, "w") as dest:
+        shutil.copyfileobj(fh, dest, STREAM_CHUNK)
+    return True
+
+def temp_archive_path(dst_zip: Path) -> Path:
+    # Keep the real suffix so ignore rules like "*.ts4script" also cover the temp
+    # file when the archive lives inside the workspace it is packed from.
+    return dst_zip.with_name(f".{dst_zip.stem}.tmp{dst_zip.suffix}")
+
+def backup_pattern(dst_zip: Path) -> str:
+    # Glob, relative to dst_zip's folder, matching backup_archive()'s files.
+    return f"{glob.escape(dst_zip.stem)}.bak_*.ts4script"
+
+def backup_archive(dst_zip: Path, keep_backups: int) -> None:
+    # Called just before the new archive replaces dst_zip. A hard link keeps
+    # the old archive under the backup name without copying it and leaves
+    # dst_zip in place; filesystems without links fall back to a rename.
+    if keep_backups <= 0 or not dst_zip.exists():
+        return
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup = dst_zip.with_suffix(f".bak_{ts}.ts4script")
+    try:
+        os.link(dst_zip, backup)
+    except OSError:
+        try:
+            os.replace(dst_zip, backup)
+        except OSError:
+            return
+    old = sorted(dst_zip.parent.glob(backup_pattern(dst_zip)))
+    for path in old[:-keep_backups]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+def zip_dir(src_dir: Path, dst_zip: Path, ignore_patterns: Sequence[str],
+            files: Optional[List[ScanEntry]] = None, keep_backups: int = 3) -> None:
+    # files: a scan_tree() result for src_dir, to skip walking the tree again.
+    if files is None:
+        files = scan_tree(src_dir, ignore_patterns)[1]
+
+    key = os.path.abspath(dst_zip)
+    src_key = os.path.abspath(src_dir)
+    cached = _PACK_CACHE.pop(key, None)
+    tmp_zip = temp_archive_path(dst_zip)
+    try:
+        with ExitStack() as stack:
+            old_fp = None
+            old_infos: Dict[str, zipfile.ZipInfo] = {}
+            old_stamps: Dict[str, Stamp] = {}
+            # Only reuse entries packed from this same workspace.
+            if cached is not None and cached[0] == src_key and file_stamp(dst_zip) == cached[1]:
+                old_fp = stack.enter_context(open(dst_zip, "rb"))
+                with zipfile.ZipFile(old_fp) as old_zf:
+                    old_infos = {zi.filename: zi for zi in old_zf.infolist()}
+                old_stamps = cached[2]
+            stamps = pack_entries(tmp_zip, files, old_fp, old_infos, old_stamps)
+        backup_archive(dst_zip, keep_backups)
+        os.replace(tmp_zip, dst_zip)
+    except BaseException:
+        try:
+            tmp_zip.unlink()
+        except OSError:
+            pass
+        raise
+    archive_stamp = file_stamp(dst_zip)
+    if archive_stamp is not None:
+        _PACK_CACHE[key] = (src_key, archive_stamp, stamps)
+
+def pack_entries(dst_zip: Path, files: List[ScanEntry], old_fp: Optional[BinaryIO],
+                 old_infos: Dict[str, zipfile.ZipInfo], old_stamps: Dict[str, Stamp]) -> Dict[str, Stamp]:
+    stamps: Dict[str, Stamp] = {}
+    # Compress on a pool but write in walk order. The window is bounded both by
+    # entry count and by PACK_BUFFER_MAX bytes; each buffered entry is at most
+    # LIBDEFLATE_MAX_SIZE, everything bigger is streamed.
+    workers = max(1, min(os.cpu_count() or 1, len(files)))
+    with zipfile.ZipFile(dst_zip, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=PACK_COMPRESSLEVEL) as zf, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        buffered = 0
+
+        def flush_one():
+            nonlocal buffered
+            zi, job, size = window.popleft()
+            buffered -= size
+            flush_entry(zf, stamps, zi, job)
+
+        for abs_path, rel, st in files:
+            stamp = (st.st_mtime_ns, st.st_size)
+            zi = zipinfo_from_stat(rel, st)
+            if os.path.splitext(rel)[1].lower() in STORED_EXTS:
+                zi.compress_type = zipfile.ZIP_STORED
+            else:
+                zi.compress_type = zipfile.ZIP_DEFLATED
+            stamps[rel] = stamp
+            old_zi = old_infos.get(rel)
+            reuse = old_zi is not None and old_stamps.get(rel) == stamp and old_zi.compress_type == zi.compress_type
+            if reuse:
+                # Unchanged since the last pack: copy the compressed bytes as-is.
+                zi.CRC = old_zi.CRC
+                zi.file_size = old_zi.file_size
+            if zi.compress_type == zipfile.ZIP_STORED or zi.file_size > LIBDEFLATE_MAX_SIZE:
+                # Written here in STREAM_CHUNK pieces; drain first to keep walk order.
+                while window:
+                    flush_one()
+                if reuse:
+                    write_raw_chunks(zf, zi, old_zi.compress_size, iter_raw_entry(old_fp, old_zi))
+                elif not stream_entry(zf, zi, abs_path):
+                    del stamps[rel]
+                continue
+            if reuse:
+                job = Future()
+                job.set_result(read_raw_entry(old_fp, old_zi))
+                size = old_zi.compress_size
+            else:
+                job = pool.submit(compress_entry, abs_path, zi)
+                size = zi.file_size
+            window.append((zi, job, size))
+            buffered += size
+            while window and (len(window) >= workers * 2 or buffered > PACK_BUFFER_MAX):
+                flush_one()
+        while window:
+            flush_one()
+    return stamps
+
+def flush_entry(zf: zipfile.ZipFile, stamps: Dict[str, Stamp], zinfo: zipfile.ZipInfo, job: Future) -> None:
+    payload = job.result()
+    if payload is None:
+        stamps.pop(zinfo.filename, None)
+        return
+    write_precompressed(zf, zinfo, payload)
+
+_WINDOWS_ILLEGAL = str.maketrans(':<>|"?*', "_______")
+
+def member_target(dst_dir: str, name: str) -> Optional[str]:
+    # Same sanitising as ZipFile.extract(): drop drives, absolute roots, "." and
+    # "..", and on Windows replace characters that are illegal in file names.
+    arcname = name.replace("/", os.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [p for p in arcname.split(os.sep) if p not in ("", os.curdir, os.pardir)]
+    if os.sep == "\\":
+        parts = [p.translate(_WINDOWS_ILLEGAL).rstrip(".") for p in parts]
+        parts = [p for p in parts if p]
+    if not parts:
+        return None
+    return os.path.join(dst_dir, *parts)
 
 def extract_zip(src_zip: Path, dst_dir: Path) -> None:
     if dst_dir.exists() and any(dst_dir.iterdir()):
         raise RuntimeError(f"Destination '{dst_dir}' is not empty.")
     dst_dir.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(src_zip, "r") as zf:
-        zf.extractall(dst_dir)
-
-def compute_tree_signature(path: Path, ignore_patterns: List[str]) -> Tuple[int, int, str]:
-    total_files = 0
-    total_size = 0
-    h = hashlib.sha256()
-    for root, dirs, files in os.walk(path):
-        root_p = Path(root)
-        kept_dirs = []
-        for d in dirs:
-            rel = (root_p / d).relative_to(path).as_posix() + "/"
-            if should_ignore(rel, ignore_patterns):
+    source = src_zip
+    if src_zip.stat().st_size <= EXTRACT_IN_MEMORY_MAX:
+        # One sequential read instead of a seek per member.
+        source = io.BytesIO(src_zip.read_bytes())
+    base = os.fspath(dst_dir)
+    made_dirs = {base}
+    with zipfile.ZipFile(source, "r") as zf:
+        for zi in zf.infolist():
+            target = member_target(base, zi.filename)
+            if target is None:
                 continue
-            kept_dirs.append(d)
-        dirs[:] = kept_dirs
-
-        for name in files:
-            abs_path = root_p / name
-            rel = abs_path.relative_to(path).as_posix()
-            if should_ignore(rel, ignore_patterns):
-                continue
-            try:
-                st = abs_path.stat()
-            except FileNotFoundError:
+            parent = target if zi.is_dir() else os.path.dirname(target)
+            if parent not in made_dirs:
+                os.makedirs(parent, exist_ok=True)
+                made_dirs.add(parent)
+            if zi.is_dir():
                 continue
-            total_files += 1
-            total_size += st.st_size
-            h.update(rel.encode("utf-8"))
-            h.update(str(st.st_mtime_ns).encode("utf-8"))
-            h.update(str(st.st_size).encode("utf-8"))
-    return total_files, total_size, h.hexdigest()
+            with zf.open(zi) as src, open(target, "wb") as out:
+                shutil.copyfileobj(src, out, STREAM_CHUNK)
 
 # ----------------------- Watcher thread -----------------------
 
 @dataclass
 class WatchState:
-    running: bool = False
+    stop_event: threading.Event = field(default_factory=threading.Event)
     thread: Optional[threading.Thread] = None
     interval: float = 2.0
-    last_sig: Optional[Tuple[int, int, str]] = None
+    last_sig: Optional[TreeSignature] = None
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and not self.stop_event.is_set()
 
 # ----------------------- GUI application -----------------------
 
@@ -149,6 +518,16 @@ class App(tk.Tk):
 
         self._build_ui()
         self.watch_state = WatchState()
+        # Single worker: extract/pack jobs and watch-mode packs run one at a
+        # time off the Tk thread, so two packs never race on one archive.
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        # Latest status text from worker threads, applied once per idle tick.
+        self._status_lock = threading.Lock()
+        self._pending_status: Optional[str] = None
+        self._status_scheduled = False
+        # Set once the window is closing; worker threads may still be running
+        # and must stop calling into Tk (after/after_idle) from then on.
+        self._closing = False
         self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._load_state()
 
@@ -184,6 +563,7 @@ class App(tk.Tk):
             "watch_src": self.watch_src.get(),
             "watch_dst": self.watch_dst.get(),
             "watch_interval": self.watch_interval.get(),
+            "watch_debounce": self.watch_debounce.get(),
             "ignore_ws": self.ignore_ws.get(),
             "selected_tab": self.nb.index(self.nb.select()),
         }
@@ -207,6 +587,10 @@ class App(tk.Tk):
             self.watch_interval.set(float(data.get("watch_interval", 2.0)))
         except Exception:
             pass
+        try:
+            self.watch_debounce.set(float(data.get("watch_debounce", 0.5)))
+        except Exception:
+            pass
         self.ignore_ws.set(data.get("ignore_ws", ""))
         idx = data.get("selected_tab")
         if isinstance(idx, int):
@@ -216,9 +600,35 @@ class App(tk.Tk):
                 pass
 
     def _on_close(self):
+        self._closing = True
         self._save_state()
+        self.watch_state.stop_event.set()
+        # A running job still finishes before the interpreter exits.
+        self._io_pool.shutdown(wait=False)
         self.destroy()
 
+    def _submit_job(self, button: ttk.Button, on_done, fn, *args):
+        button.configure(state="disabled")
+
+        def finished(fut):
+            if self._closing:
+                return
+            button.configure(state="normal")
+            on_done(fut)
+
+        fut = self._io_pool.submit(fn, *args)
+        fut.add_done_callback(lambda f: self._call_in_tk(self.after, 0, finished, f))
+
+    def _call_in_tk(self, schedule, *args):
+        # Hands work from a worker thread to the Tk loop. Once closing, or if the
+        # window is destroyed between the check and the call, the work is dropped.
+        if self._closing:
+            return
+        try:
+            schedule(*args)
+        except (tk.TclError, RuntimeError):
+            pass
+
     # ---------------- Extract tab ----------------
     def _build_extract_tab(self):
         f = self.tab_extract
@@ -234,7 +644,8 @@ class App(tk.Tk):
         ttk.Entry(f, textvariable=self.extract_dst, width=70).grid(row=1, column=1, **pad)
         ttk.Button(f, text="Choose", command=self._pick_extract_dst).grid(row=1, column=2, **pad)
 
-        ttk.Button(f, text="Extract", command=self._do_extract).grid(row=2, column=1, sticky="e", **pad)
+        self.btn_extract = ttk.Button(f, text="Extract", command=self._do_extract)
+        self.btn_extract.grid(row=2, column=1, sticky="e", **pad)
 
         for i in range(3):
             f.grid_columnconfigure(i, weight=1)
@@ -257,13 +668,21 @@ class App(tk.Tk):
                 raise RuntimeError("Source file not found.")
             if dst.exists() and any(Path(dst).iterdir()):
                 raise RuntimeError("Destination must be empty or non-existent.")
-            extract_zip(src, dst)
-            self.status.set(f"Extracted to {dst}")
-            messagebox.showinfo("Done", f"Extracted to:\n{dst}")
+            self.status.set(f"Extracting to {dst}...")
+            self._submit_job(self.btn_extract, lambda fut: self._extract_done(fut, dst), extract_zip, src, dst)
         except Exception as e:
             messagebox.showerror("Extract error", str(e))
             self.status.set(f"Extract error: {e}")
 
+    def _extract_done(self, fut, dst: Path):
+        e = fut.exception()
+        if e is not None:
+            messagebox.showerror("Extract error", str(e))
+            self.status.set(f"Extract error: {e}")
+            return
+        self.status.set(f"Extracted to {dst}")
+        messagebox.showinfo("Done", f"Extracted to:\n{dst}")
+
     # ---------------- Pack tab ----------------
     def _build_pack_tab(self):
         f = self.tab_pack
@@ -279,7 +698,8 @@ class App(tk.Tk):
         ttk.Entry(f, textvariable=self.pack_dst, width=70).grid(row=1, column=1, **pad)
         ttk.Button(f, text="Browse", command=self._pick_pack_dst).grid(row=1, column=2, **pad)
 
-        ttk.Button(f, text="Pack", command=self._do_pack).grid(row=2, column=1, sticky="e", **pad)
+        self.btn_pack = ttk.Button(f, text="Pack", command=self._do_pack)
+        self.btn_pack.grid(row=2, column=1, sticky="e", **pad)
 
         for i in range(3):
             f.grid_columnconfigure(i, weight=1)
@@ -300,15 +720,23 @@ class App(tk.Tk):
             dst = Path(self.pack_dst.get()).expanduser()
             if not src.exists():
                 raise RuntimeError("Workspace not found.")
-            patterns = read_ignore_file(src)
+            patterns = get_ignore_patterns(src)
             dst.parent.mkdir(parents=True, exist_ok=True)
-            zip_dir(src, dst, patterns)
-            self.status.set(f"Packed: {dst}")
-            messagebox.showinfo("Done", f"Packed:\n{dst}")
+            self.status.set(f"Packing {dst}...")
+            self._submit_job(self.btn_pack, lambda fut: self._pack_done(fut, dst), zip_dir, src, dst, patterns)
         except Exception as e:
             messagebox.showerror("Pack error", str(e))
             self.status.set(f"Pack error: {e}")
 
+    def _pack_done(self, fut, dst: Path):
+        e = fut.exception()
+        if e is not None:
+            messagebox.showerror("Pack error", str(e))
+            self.status.set(f"Pack error: {e}")
+            return
+        self.status.set(f"Packed: {dst}")
+        messagebox.showinfo("Done", f"Packed:\n{dst}")
+
     # ---------------- Watch tab ----------------
     def _build_watch_tab(self):
         f = self.tab_watch
@@ -328,8 +756,12 @@ class App(tk.Tk):
         self.watch_interval = tk.DoubleVar(value=2.0)
         ttk.Entry(f, textvariable=self.watch_interval, width=10).grid(row=2, column=1, sticky="w", **pad)
 
+        ttk.Label(f, text="Debounce (sec):").grid(row=3, column=0, sticky="w", **pad)
+        self.watch_debounce = tk.DoubleVar(value=0.5)
+        ttk.Entry(f, textvariable=self.watch_debounce, width=10).grid(row=3, column=1, sticky="w", **pad)
+
         self.btn_watch = ttk.Button(f, text="Start Watching", command=self._toggle_watch)
-        self.btn_watch.grid(row=3, column=1, sticky="e", **pad)
+        self.btn_watch.grid(row=4, column=1, sticky="e", **pad)
 
         for i in range(3):
             f.grid_columnconfigure(i, weight=1)
@@ -346,7 +778,7 @@ class App(tk.Tk):
 
     def _toggle_watch(self):
         if self.watch_state.running:
-            self.watch_state.running = False
+            self.watch_state.stop_event.set()
             self.btn_watch.configure(text="Start Watching")
             self.status.set("Watcher stopped.")
             return
@@ -356,33 +788,111 @@ class App(tk.Tk):
         if not src.exists():
             messagebox.showerror("Watch error", "Workspace not found.")
             return
-        patterns = read_ignore_file(src)
         interval = float(self.watch_interval.get())
+        debounce = max(0.0, float(self.watch_debounce.get()))
 
-        self.watch_state.running = True
+        # A fresh event per session: a previous loop may still be finishing a pack.
+        stop = threading.Event()
+        self.watch_state.stop_event = stop
         self.btn_watch.configure(text="Stop Watching")
-        self.status.set(f"Watching '{src}' -> '{dst}' every {interval}s.")
+        if fs_watch is not None:
+            self.status.set(f"Watching '{src}' -> '{dst}' (filesystem events).")
+        else:
+            self.status.set(f"Watching '{src}' -> '{dst}' every {interval}s.")
 
-        def loop():
+        def pack(patterns: Tuple[str, ...], files: Optional[List[ScanEntry]] = None):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            self._io_pool.submit(zip_dir, src, dst, patterns, files).result()
+            self._set_status_threadsafe(f"[{time.strftime('%H:%M:%S')}] Change detected -> packed {dst}")
+
+        base = os.path.join(os.path.abspath(src), "")
+        base_len = len(base)
+
+        # Our own writes (archive, temp file, backups) must never trigger a pack,
+        # whatever the ignore rules say, or event mode would repack endlessly.
+        own_outputs = {os.path.normcase(os.path.abspath(p)) for p in (dst, temp_archive_path(dst))}
+        dst_dir = os.path.normcase(os.path.dirname(os.path.abspath(dst)))
+        backup_glob = os.path.normcase(backup_pattern(dst))
+
+        def is_relevant(changed: str, rules: IgnoreRules) -> bool:
+            norm = os.path.normcase(changed)
+            if norm in own_outputs:
+                return False
+            if os.path.dirname(norm) == dst_dir and fnmatch.fnmatchcase(os.path.basename(norm), backup_glob):
+                return False
+            if not changed.startswith(base):
+                return True
+            return not is_ignored(changed[base_len:], rules)
+
+        def poll_loop():
             last_sig = None
-            while self.watch_state.running:
+            while not stop.is_set():
                 try:
-                    sig = compute_tree_signature(src, patterns)
+                    # Re-checked every tick so .ts4ignore edits apply immediately.
+                    patterns = get_ignore_patterns(src)
+                    sig, files = scan_tree(src, patterns)
                     if sig != last_sig:
-                        dst.parent.mkdir(parents=True, exist_ok=True)
-                        zip_dir(src, dst, patterns)
-                        self._set_status_threadsafe(f"[{time.strftime('%H:%M:%S')}] Change detected -> packed {dst}")
+                        # Pack only once two samples `debounce` apart agree, so a
+                        # burst of saves (checkout, reformat) packs just once.
+                        while debounce and not stop.wait(debounce):
+                            settled_sig, files = scan_tree(src, patterns)
+                            if settled_sig == sig:
+                                break
+                            sig = settled_sig
+                        if stop.is_set():
+                            break
+                        pack(patterns, files)
                         last_sig = sig
                 except Exception as e:
                     self._set_status_threadsafe(f"Watch error: {e}")
-                time.sleep(interval)
+                stop.wait(interval)
+
+        def event_loop():
+            try:
+                pack(get_ignore_patterns(src))
+            except Exception as e:
+                self._set_status_threadsafe(f"Watch error: {e}")
+            # watch_filter=None: watchfiles' DefaultFilter would silently drop *.pyc,
+            # __pycache__/, .git/ etc.; .ts4ignore (is_relevant) is the only filter.
+            for changes in fs_watch(src, watch_filter=None, stop_event=stop, debounce=int(debounce * 1000)):
+                patterns = get_ignore_patterns(src)
+                rules = compile_ignore(patterns)
+                if not any(is_relevant(p, rules) for _, p in changes):
+                    continue
+                try:
+                    pack(patterns)
+                except Exception as e:
+                    self._set_status_threadsafe(f"Watch error: {e}")
+
+        def loop():
+            if fs_watch is not None:
+                try:
+                    event_loop()
+                    return
+                except Exception as e:
+                    # e.g. inotify watch limit reached or unsupported filesystem.
+                    self._set_status_threadsafe(f"Filesystem events unavailable ({e}); polling every {interval}s.")
+            poll_loop()
 
         t = threading.Thread(target=loop, daemon=True)
         self.watch_state.thread = t
         t.start()
 
     def _set_status_threadsafe(self, text: str):
-        self.after(0, lambda: self.status.set(text))
+        with self._status_lock:
+            self._pending_status = text
+            if self._status_scheduled:
+                return
+            self._status_scheduled = True
+        self._call_in_tk(self.after_idle, self._flush_status)
+
+    def _flush_status(self):
+        with self._status_lock:
+            text = self._pending_status
+            self._pending_status = None
+            self._status_scheduled = False
+        if text is not None and not self._closing:
+            self.status.set(text)
 
     # ---------------- Ignore tab ----------------
     def _build_ignore_tab(self):
@@ -394,7 +904,8 @@ class App(tk.Tk):
         ttk.Entry(f, textvariable=self.ignore_ws, width=70).grid(row=0, column=1, **pad)
         ttk.Button(f, text="Choose", command=self._pick_ignore_ws).grid(row=0, column=2, **pad)
 
-        self.ignore_text = tk.Text(f, height=20)
+        # Patterns are one per line: no wrapping, and no undo stack to maintain.
+        self.ignore_text = tk.Text(f, height=20, undo=False, autoseparators=False, wrap="none")
         self.ignore_text.grid(row=1, column=0, columnspan=3, sticky="nsew", **pad)
 
         btns = ttk.Frame(f)
@@ -425,8 +936,8 @@ class App(tk.Tk):
     def _ignore_save(self):
         try:
             ws = Path(self.ignore_ws.get()).expanduser()
-            raw = self.ignore_text.get("1.0", "end").splitlines()
-            patterns = [ln.strip() for ln in raw if ln.strip()]
+            raw = self.ignore_text.get("1.0", "end-1c")
+            patterns = [ln.strip() for ln in raw.split("\n") if ln and not ln.isspace()]
             write_ignore_file(ws, patterns)
             self.status.set("Saved ignore patterns.")
             messagebox.showinfo("Saved", ".ts4ignore updated.")